@@ -1,13 +1,15 @@
 import streamlit as st
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+import hashlib
 import io
-import textwrap
+from pathlib import Path
 
+# Only the two tiny constant modules load up front; the canvas, image and colour
+# machinery (which pulls in PIL) is imported on the first PDF build.
 from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 from reportlab.lib.units import mm
-from reportlab.lib import colors
-from reportlab.lib.utils import ImageReader
 
 # =========================================================
 # APP IDENTITY
@@ -25,31 +27,165 @@ PRIVACY_BANNER = (
 NOT_RECORD_DISCLAIMER = "This tool supports handover communication only. It is not a clinical record and is not medical advice."
 DATA_STATEMENT = "No data is stored. Nothing is saved once the page is refreshed."
 
+# Dark theme stylesheet (background same as sidebar)
+CSS_PATH = Path(__file__).parent / "static" / "app.css"
+
+# Generated outputs are memoised per input so reruns don't rebuild them.
+# Keep the cache small and short-lived so submissions age out quickly.
+CACHE_TTL_SECONDS = 600
+CACHE_MAX_ENTRIES = 32
+PDF_CACHE_MAX_ENTRIES = 8  # PDFs are far larger than the text outputs
+
+# Long sections are cut to this many bullets in the on-screen summary (the PDF keeps everything).
+PREVIEW_LIMIT = 20
+
 # =========================================================
 # COLOURS (PDF)
 # =========================================================
-BRAND_DARK = colors.HexColor("#0f172a")
-BRAND_ACCENT = colors.HexColor("#2563eb")
-TEXT_DARK = colors.HexColor("#0f172a")
-TEXT_MUTED = colors.HexColor("#475569")
-BORDER = colors.HexColor("#CBD5E1")
-BG_SOFT = colors.HexColor("#F1F5F9")
+def _rgb(hex_code: str) -> tuple[float, float, float]:
+    """'#rrggbb' -> (r, g, b) in 0..1, which the canvas colour setters accept directly."""
+    v = int(hex_code.lstrip("#"), 16)
+    return ((v >> 16) / 255, ((v >> 8) & 0xFF) / 255, (v & 0xFF) / 255)
+
+
+BRAND_DARK = _rgb("#0f172a")
+BRAND_ACCENT = _rgb("#2563eb")
+TEXT_DARK = _rgb("#0f172a")
+TEXT_MUTED = _rgb("#475569")
+BORDER = _rgb("#CBD5E1")
+BG_SOFT = _rgb("#F1F5F9")
+WHITE = (1, 1, 1)
+
+# =========================================================
+# PDF LAYOUT (points, precomputed from mm)
+# =========================================================
+# Detailed (multi-page)
+MARGIN_D = 16 * mm
+CONTENT_BOTTOM_D = MARGIN_D + 20 * mm
+SECTION_BASE_D = (10 + 8 + 18) * mm
+SECTION_PER_LINE_D = 5.4 * mm
+TITLE_GAP_D = 6 * mm
+CARD_PAD_D = 6 * mm
+LINE_H_D = 5.2 * mm
+TEXT_INSET_D = 7 * mm
+SECTION_GAP_D = 8 * mm
+HEADER_BAR_D = 20 * mm
+HEADER_GAP_D = 8 * mm
+LOGO_TOP_D = 4 * mm
+LOGO_MAX_W_D = 26 * mm
+LOGO_MAX_H_D = 14 * mm
+LOGO_GAP_D = 30 * mm
+TITLE_BASE_D = 13.5 * mm
+BRAND_BASE_D = 13.3 * mm
+COMPACT_BAR_D = 10 * mm
+COMPACT_BASE_D = 7 * mm
+COMPACT_GAP_D = 10 * mm
+FOOTER_RULE_D = 12 * mm
+
+# One-page (condensed)
+MARGIN_C = 14 * mm
+TITLE_GAP_C = 5 * mm
+CARD_PAD_C = 8 * mm
+TEXT_TOP_C = 6 * mm
+TEXT_INSET_C = 6 * mm
+LINE_H_C = 4.8 * mm
+BLOCK_GAP_C = 6 * mm
+HEADER_BAR_C = 16 * mm
+LOGO_TOP_C = 3 * mm
+LOGO_MAX_W_C = 22 * mm
+LOGO_MAX_H_C = 12 * mm
+LOGO_GAP_C = 26 * mm
+TITLE_BASE_C = 11.3 * mm
+BRAND_BASE_C = 11.0 * mm
+META_TOP_C = 18 * mm
+META_H_C = 10 * mm
+META_INSET_C = 4 * mm
+META_SHIFT_X_C = 70 * mm
+META_BASE_C = 6.6 * mm
+META_GAP_C = 16 * mm
+FOOTER_RULE_C = 11 * mm
+
+# Footer text baselines, above the bottom margin (both styles)
+FOOTER_LINE1 = 6 * mm
+FOOTER_LINE2 = 2.5 * mm
+FOOTER_APP_LINE = f"{APP_NAME} {APP_VERSION} • Support: {SUPPORT_EMAIL}"
 
 # =========================================================
 # HELPERS
 # =========================================================
-def now_str():
-    return datetime.now().strftime("%d %b %Y, %H:%M")
+def now_str(now: datetime | None = None) -> str:
+    return (now or datetime.now()).strftime("%d %b %Y, %H:%M")
+
 
+BULLET_CHARS = " \t-•"  # stripped from both ends of each input line
 
-def clean_lines(text: str) -> list[str]:
+
+@lru_cache(maxsize=256)
+def clean_lines(text: str) -> tuple[str, ...]:
     if not text:
-        return []
-    lines = [ln.strip(" \t-•") for ln in text.splitlines()]
-    return [ln for ln in lines if ln.strip()]
+        return ()
+    return tuple(s for ln in text.splitlines() if (s := ln.strip(BULLET_CHARS)) and not s.isspace())
+
+
+# Wrap widths (characters) for PDF card text.
+WRAP_SECTION_D = 92
+WRAP_NOTES_D = 100
+WRAP_BLOCK_C = 95
+
+_ASCII_WS_TO_SPACE = str.maketrans("\t\n\x0b\x0c\r", "     ")
+
+
+def greedy_wrap(text: str, width: int) -> list[str]:
+    """
+    Pack words into lines of at most width characters; a word longer than width gets its own line.
+    Same output as textwrap with break_long_words/break_on_hyphens off, except runs of spaces
+    collapse to one. Only ASCII whitespace breaks, so non-breaking spaces hold.
+    """
+    lines, cur, cur_len = [], [], 0
+    for w in text.translate(_ASCII_WS_TO_SPACE).split(" "):
+        if not w:
+            continue
+        if cur and cur_len + 1 + len(w) > width:
+            lines.append(" ".join(cur))
+            cur, cur_len = [w], len(w)
+        else:
+            cur_len += len(w) + (1 if cur else 0)
+            cur.append(w)
+    if cur:
+        lines.append(" ".join(cur))
+    return lines
+
+
+def layout_bullets(
+    text: str,
+    width: int,
+    bullet: str,
+    indent: str,
+    empty: str,
+    limit: int | None = None,
+) -> tuple[str, ...]:
+    """
+    Final card lines for a section: bullet on each item's first line, indent on continuations.
+    With a limit, wrapping stops as soon as limit + 1 lines exist (enough to tell it overflowed).
+    """
+    if not text or text.isspace():
+        return (empty,)
+    items = clean_lines(text)
+    if not items:
+        return (empty,)
+    lines = []
+    for it in items:
+        wrapped = greedy_wrap(it, width)
+        lines.append(bullet + wrapped[0])
+        lines.extend(indent + cont for cont in wrapped[1:])
+        if limit is not None and len(lines) > limit:
+            break
+    return tuple(lines)
 
 
 def pick_items(text: str, n: int) -> str:
+    if not text or text.isspace():
+        return "none"
     items = clean_lines(text)
     if not items:
         return "none"
@@ -67,7 +203,7 @@ def check_access():
         return
 
     st.markdown("## 🔒 Access Required")
-    st.markdown("Enter your access code to use this tool.")
+    st.text("Enter your access code to use this tool.")
     code = st.text_input("Access code", type="password")
 
     if st.button("Unlock", use_container_width=True):
@@ -99,6 +235,11 @@ def request_template(name: str):
     st.session_state["_do_template"] = name
 
 
+PDF_STYLES = {
+    "detailed": "Detailed (multi-page)",
+    "onepage": "One-page (condensed)",
+}
+
 TEMPLATES = {
     "Care Home": {
         "incidents": "Fall (time, location, injury/no injury)\nMedication error (what, when, action taken)\nSafeguarding concern (brief + escalated to who)",
@@ -123,46 +264,56 @@ TEMPLATES = {
     },
 }
 
+# Widget values on first load and after Clear.
+DEFAULTS = {
+    "org_name": "",
+    "area": "",
+    "shift": "Day",
+    "completed_by": "",
+    "reviewed_by": "",
+    "review_date": "",
+    "incidents": "",
+    "staffing": "",
+    "residents": "",
+    "tasks": "",
+    "escalation": "",
+    "pdf_style": "detailed",
+    "print_safe": False,
+}
+
+# Demo content; review_date is filled in with today's date when applied.
+DEMO = {
+    **DEFAULTS,
+    "org_name": "Example Care Home",
+    "area": "Cedar Wing",
+    "shift": "Night",
+    "completed_by": "Senior Carer",
+    "reviewed_by": "Nurse in Charge",
+    "incidents": "Non-injury fall in lounge at 21:10; monitoring plan in place\nMedication delay identified (non-critical); follow up in morning",
+    "staffing": "1 HCA short from 02:00–07:00\nAgency staff briefed on escalation and call bell response",
+    "residents": "Resident A: reduced oral intake; encourage fluids; monitor overnight\nResident B: agitation after 23:00; reassurance and observe",
+    "tasks": "Re-check obs at 01:00 for Resident A\nRestock continence supplies\nChase GP callback in morning",
+    "escalation": "Escalated to senior on shift as appropriate; continue monitoring overnight.",
+}
+
 
 def apply_state_actions_before_widgets():
     """
     Apply queued changes BEFORE widgets instantiate to avoid:
     StreamlitAPIException: session_state.<key> cannot be modified after widget is instantiated.
     """
+    if not st.session_state.get("_inited"):
+        st.session_state.update(DEFAULTS)
+        st.session_state["_inited"] = True
+
     if st.session_state.get("_do_clear"):
-        st.session_state.update({
-            "org_name": "",
-            "area": "",
-            "shift": "Day",
-            "completed_by": "",
-            "reviewed_by": "",
-            "review_date": "",
-            "incidents": "",
-            "staffing": "",
-            "residents": "",
-            "tasks": "",
-            "escalation": "",
-            "pdf_style": "Detailed (multi-page)",
-            "print_safe": False,
-        })
+        st.session_state.update(DEFAULTS)
+        st.session_state.pop("last_output", None)
         st.session_state["_do_clear"] = False
 
     if st.session_state.get("_do_demo"):
-        st.session_state.update({
-            "org_name": "Example Care Home",
-            "area": "Cedar Wing",
-            "shift": "Night",
-            "completed_by": "Senior Carer",
-            "reviewed_by": "Nurse in Charge",
-            "review_date": datetime.now().strftime("%d %b %Y"),
-            "incidents": "Non-injury fall in lounge at 21:10; monitoring plan in place\nMedication delay identified (non-critical); follow up in morning",
-            "staffing": "1 HCA short from 02:00–07:00\nAgency staff briefed on escalation and call bell response",
-            "residents": "Resident A: reduced oral intake; encourage fluids; monitor overnight\nResident B: agitation after 23:00; reassurance and observe",
-            "tasks": "Re-check obs at 01:00 for Resident A\nRestock continence supplies\nChase GP callback in morning",
-            "escalation": "Escalated to senior on shift as appropriate; continue monitoring overnight.",
-            "pdf_style": "Detailed (multi-page)",
-            "print_safe": False,
-        })
+        st.session_state.update(DEMO)
+        st.session_state["review_date"] = datetime.now().strftime("%d %b %Y")
         st.session_state["_do_demo"] = False
 
     tmpl = st.session_state.get("_do_template", "")
@@ -182,6 +333,7 @@ def apply_state_actions_before_widgets():
 # =========================================================
 # OUTPUT BUILDERS
 # =========================================================
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def make_sbar_oneliner(area, shift, incidents, staffing, residents, tasks, escalation) -> str:
     s = f"{area or 'Area'} {shift}: "
     b = f"incidents {pick_items(incidents, 2)}, staffing {pick_items(staffing, 2)}; "
@@ -192,13 +344,46 @@ def make_sbar_oneliner(area, shift, incidents, staffing, residents, tasks, escal
     return (s + b + a + r + ".").strip()
 
 
-def make_handover_summary_md(area, shift, created_at, incidents, staffing, residents, tasks, escalation, reviewed_by, review_date, print_safe) -> str:
-    def section(title: str, items: list[str]) -> str:
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def _summary_body_md(incidents, staffing, residents, tasks, escalation) -> str:
+    """Section bullets + notes. Keyed only on the free-text fields, so a new timestamp doesn't rebuild it."""
+    def section(title: str, text: str) -> str:
+        items = clean_lines(text) if text and not text.isspace() else ()
         if not items:
             return f"**{title}:** None reported.\n"
-        bullets = "\n".join([f"- {x}" for x in items])
+        bullets = "\n".join([f"- {x}" for x in items[:PREVIEW_LIMIT]])
+        if len(items) > PREVIEW_LIMIT:
+            bullets += f"\n- _…and {len(items) - PREVIEW_LIMIT} more (see **Show all items** below)_"
         return f"**{title}:**\n{bullets}\n"
 
+    esc = escalation.strip()
+    return "\n".join([
+        section("Incidents today", incidents),
+        section("Staffing issues", staffing),
+        section("Residents of concern", residents),
+        section("Tasks outstanding", tasks),
+        f"**Escalation / Notes:** {esc if esc else 'None.'}\n",
+    ])
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def summary_overflow_md(incidents, staffing, residents, tasks) -> str:
+    """Bullets cut from the on-screen summary by PREVIEW_LIMIT, grouped by section ("" if none)."""
+    parts = []
+    for title, text in (
+        ("Incidents today", incidents),
+        ("Staffing issues", staffing),
+        ("Residents of concern", residents),
+        ("Tasks outstanding", tasks),
+    ):
+        rest = clean_lines(text)[PREVIEW_LIMIT:]
+        if rest:
+            bullets = "\n".join([f"- {x}" for x in rest])
+            parts.append(f"**{title} (continued):**\n{bullets}\n")
+    return "\n".join(parts)
+
+
+def make_handover_summary_md(area, shift, created_at, incidents, staffing, residents, tasks, escalation, reviewed_by, review_date, print_safe) -> str:
     header = (
         f"### Handover Summary\n"
         f"**Area:** {area or '—'} &nbsp;&nbsp;|&nbsp;&nbsp; "
@@ -206,19 +391,6 @@ def make_handover_summary_md(area, shift, created_at, incidents, staffing, resid
         f"**Generated:** {created_at}\n"
     )
 
-    body = (
-        section("Incidents today", clean_lines(incidents))
-        + "\n"
-        + section("Staffing issues", clean_lines(staffing))
-        + "\n"
-        + section("Residents of concern", clean_lines(residents))
-        + "\n"
-        + section("Tasks outstanding", clean_lines(tasks))
-    )
-
-    esc = escalation.strip()
-    esc_line = f"\n**Escalation / Notes:** {esc if esc else 'None.'}\n"
-
     if print_safe:
         reviewed_block = "\n---\n**Reviewed by:** (hidden – print-safe mode)\n"
     else:
@@ -228,16 +400,73 @@ def make_handover_summary_md(area, shift, created_at, incidents, staffing, resid
             f"**Review date:** {review_date.strip() or '—'}\n"
         )
 
-    return header + "\n" + body + esc_line + reviewed_block
+    return f"{header}\n{_summary_body_md(incidents, staffing, residents, tasks, escalation)}{reviewed_block}"
 
 
 # =========================================================
 # PDF HELPERS
 # =========================================================
+# ReportLab writes a state operator for every set* call, even when the value
+# is unchanged. These compare against the canvas's own tracked state first.
+# Those are private attributes, hence the ReportLab version range in requirements.txt.
+def _set_font(c, name: str, size: float):
+    if c._fontname != name or c._fontsize != size:
+        c.setFont(name, size)
+
+
+def _set_fill(c, color):
+    if c._fillColorObj != color:
+        c.setFillColor(color)
+
+
+def _set_stroke(c, color):
+    if c._strokeColorObj != color:
+        c.setStrokeColor(color)
+
+
+def _set_line_width(c, width: float):
+    if c._lineWidth != width:
+        c.setLineWidth(width)
+
+
+@dataclass(slots=True, frozen=True)
+class PdfContext:
+    """Header/footer text for one PDF build, normalised once up front."""
+    brand: str
+    review_line: str  # footer "Reviewed by" text, "" when there is nothing to show
+
+
+def _pdf_context(*, org_name: str, reviewed_by: str, review_date: str, print_safe: bool) -> PdfContext:
+    def shown(value: str) -> str:
+        # Print-safe mode hides identity fields entirely.
+        return "" if print_safe else (value.strip() if value else "")
+
+    rb = shown(reviewed_by)
+    rd = shown(review_date)
+    return PdfContext(
+        brand=org_name.strip() or APP_NAME,
+        review_line=f"Reviewed by: {rb or '—'} • {rd or '—'}" if rb or rd else "",
+    )
+
+
+def _new_canvas(buf: io.BytesIO):
+    from reportlab import rl_config
+    from reportlab.pdfgen import canvas
+
+    # Write PDF streams as raw binary rather than ASCII85: smaller files, less encoding work.
+    rl_config.useA85 = 0
+    # Compression is ReportLab's default too; pinned here so a site-wide rl_config can't turn it off.
+    return canvas.Canvas(buf, pagesize=A4, pageCompression=1)
+
+
 def _draw_logo_if_present(c, logo_bytes: bytes | None, x: float, y: float, max_w: float, max_h: float):
     if not logo_bytes:
         return
+    from reportlab.lib.utils import ImageReader
+
     try:
+        # A fresh reader per build: ImageReader keeps a file position and decode buffers,
+        # so one shared across sessions isn't safe to draw from concurrently.
         img = ImageReader(io.BytesIO(logo_bytes))
         iw, ih = img.getSize()
         scale = min(max_w / iw, max_h / ih)
@@ -248,6 +477,7 @@ def _draw_logo_if_present(c, logo_bytes: bytes | None, x: float, y: float, max_w
         return
 
 
+@st.cache_data(max_entries=PDF_CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def pdf_build_detailed(
     *,
     logo_bytes: bytes | None,
@@ -267,158 +497,139 @@ def pdf_build_detailed(
     print_safe: bool,
 ) -> bytes:
     buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4)
+    c = _new_canvas(buf)
     width, height = A4
 
-    margin_x = 16 * mm
-    margin_top = 16 * mm
-    margin_bottom = 16 * mm
+    margin_x = MARGIN_D
+    margin_top = MARGIN_D
+    margin_bottom = MARGIN_D
     content_w = width - 2 * margin_x
+    title_x = margin_x + (LOGO_GAP_D if logo_bytes else 0)  # title sits right of the logo, if any
     y = height - margin_top
 
-    completed_by_pdf = "" if print_safe else (completed_by.strip() if completed_by else "")
-    reviewed_by_pdf = "" if print_safe else (reviewed_by.strip() if reviewed_by else "")
-    review_date_pdf = "" if print_safe else (review_date.strip() if review_date else "")
+    ctx = _pdf_context(
+        org_name=org_name,
+        reviewed_by=reviewed_by,
+        review_date=review_date,
+        print_safe=print_safe,
+    )
+    gen_line = f"Generated: {created_at}"
+    compact_line = f"{area or '—'} • {shift} • {created_at}"
 
     def footer(page_num: int):
-        c.setStrokeColor(BORDER)
-        c.setLineWidth(1)
-        c.line(margin_x, margin_bottom + 12 * mm, width - margin_x, margin_bottom + 12 * mm)
-
-        c.setFont("Helvetica", 8.8)
-        c.setFillColor(TEXT_MUTED)
-        c.drawString(margin_x, margin_bottom + 6 * mm, f"Generated: {created_at}")
-        c.drawRightString(width - margin_x, margin_bottom + 6 * mm, f"Page {page_num}")
+        _set_stroke(c, BORDER)
+        _set_line_width(c, 1)
+        c.line(margin_x, margin_bottom + FOOTER_RULE_D, width - margin_x, margin_bottom + FOOTER_RULE_D)
 
-        c.setFont("Helvetica", 8.3)
-        c.setFillColor(TEXT_MUTED)
-        c.drawString(margin_x, margin_bottom + 2.5 * mm, f"{APP_NAME} {APP_VERSION} • Support: {SUPPORT_EMAIL}")
+        _set_font(c, "Helvetica", 8.8)
+        _set_fill(c, TEXT_MUTED)
+        c.drawString(margin_x, margin_bottom + FOOTER_LINE1, gen_line)
+        c.drawRightString(width - margin_x, margin_bottom + FOOTER_LINE1, f"Page {page_num}")
 
-        if reviewed_by_pdf or review_date_pdf:
-            rb = reviewed_by_pdf if reviewed_by_pdf else "—"
-            rd = review_date_pdf if review_date_pdf else "—"
-            c.drawRightString(width - margin_x, margin_bottom + 2.5 * mm, f"Reviewed by: {rb} • {rd}")
+        _set_font(c, "Helvetica", 8.3)
+        _set_fill(c, TEXT_MUTED)
+        c.drawString(margin_x, margin_bottom + FOOTER_LINE2, FOOTER_APP_LINE)
 
-    def new_page(page_num: int):
-        c.showPage()
-        return height - margin_top
+        if ctx.review_line:
+            c.drawRightString(width - margin_x, margin_bottom + FOOTER_LINE2, ctx.review_line)
 
-    def ensure_space(required_mm: float, page_num: int) -> tuple[float, int]:
+    def ensure_space(required: float, page_num: int) -> tuple[float, int]:
         nonlocal y
-        if y - required_mm < (margin_bottom + 20 * mm):
+        if y - required < CONTENT_BOTTOM_D:
             footer(page_num)
-            y = new_page(page_num + 1)
+            c.showPage()
             page_num += 1
             draw_compact_header()
         return y, page_num
 
     def draw_header_bar():
         nonlocal y
-        bar_h = 20 * mm
-        c.setFillColor(BRAND_DARK)
+        bar_h = HEADER_BAR_D
+        _set_fill(c, BRAND_DARK)
         c.rect(0, height - bar_h, width, bar_h, fill=1, stroke=0)
 
-        _draw_logo_if_present(c, logo_bytes, margin_x, height - 4 * mm, max_w=26 * mm, max_h=14 * mm)
+        _draw_logo_if_present(c, logo_bytes, margin_x, height - LOGO_TOP_D, max_w=LOGO_MAX_W_D, max_h=LOGO_MAX_H_D)
 
-        c.setFillColor(colors.white)
-        c.setFont("Helvetica-Bold", 15)
-        c.drawString(margin_x + (30 * mm if logo_bytes else 0), height - 13.5 * mm, "Shift Handover")
+        _set_fill(c, WHITE)
+        _set_font(c, "Helvetica-Bold", 15)
+        c.drawString(title_x, height - TITLE_BASE_D, "Shift Handover")
 
-        c.setFont("Helvetica", 10)
-        brand = org_name.strip() if org_name.strip() else APP_NAME
-        c.drawRightString(width - margin_x, height - 13.3 * mm, brand)
+        _set_font(c, "Helvetica", 10)
+        c.drawRightString(width - margin_x, height - BRAND_BASE_D, ctx.brand)
 
-        y = height - bar_h - 8 * mm
+        y = height - bar_h - HEADER_GAP_D
 
     def draw_compact_header():
         nonlocal y
-        c.setFillColor(BG_SOFT)
-        c.setLineWidth(0)
-        c.rect(0, height - 10 * mm, width, 10 * mm, fill=1, stroke=0)
+        _set_fill(c, BG_SOFT)
+        c.rect(0, height - COMPACT_BAR_D, width, COMPACT_BAR_D, fill=1, stroke=0)
 
-        c.setFillColor(TEXT_DARK)
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(margin_x, height - 7 * mm, "Shift Handover")
-        c.setFont("Helvetica", 9)
-        c.setFillColor(TEXT_MUTED)
-        c.drawRightString(width - margin_x, height - 7 * mm, f"{area or '—'} • {shift} • {created_at}")
+        _set_fill(c, TEXT_DARK)
+        _set_font(c, "Helvetica-Bold", 10)
+        c.drawString(margin_x, height - COMPACT_BASE_D, "Shift Handover")
+        _set_font(c, "Helvetica", 9)
+        _set_fill(c, TEXT_MUTED)
+        c.drawRightString(width - margin_x, height - COMPACT_BASE_D, compact_line)
 
-        y = height - 10 * mm - 10 * mm
+        y = height - COMPACT_BAR_D - COMPACT_GAP_D
 
     def draw_section(title: str, items_text: str, page_num: int) -> int:
         nonlocal y
-        items = clean_lines(items_text)
+        bullet_lines = layout_bullets(items_text, WRAP_SECTION_D, "• ", "   ", "None reported.")
 
-        wrap_width = 92
-        bullet_lines = []
-        if not items:
-            bullet_lines = ["None reported."]
-        else:
-            for it in items:
-                wrapped = textwrap.wrap(it, width=wrap_width, break_long_words=False, break_on_hyphens=False)
-                bullet_lines.append("• " + wrapped[0])
-                for cont in wrapped[1:]:
-                    bullet_lines.append("   " + cont)
-
-        required = (10 + 8 + len(bullet_lines) * 5.4 + 18) * mm
+        required = SECTION_BASE_D + len(bullet_lines) * SECTION_PER_LINE_D
         y, page_num = ensure_space(required, page_num)
 
-        c.setFont("Helvetica-Bold", 12)
-        c.setFillColor(TEXT_DARK)
+        _set_font(c, "Helvetica-Bold", 12)
+        _set_fill(c, TEXT_DARK)
         c.drawString(margin_x, y, title)
-        y -= 6 * mm
+        y -= TITLE_GAP_D
 
-        card_padding_top = 6 * mm
-        line_h = 5.2 * mm
-        card_h = (card_padding_top + len(bullet_lines) * line_h + 6 * mm)
+        card_h = CARD_PAD_D + len(bullet_lines) * LINE_H_D + CARD_PAD_D
 
-        c.setFillColor(colors.white)
-        c.setStrokeColor(BORDER)
-        c.setLineWidth(1)
+        _set_fill(c, WHITE)
+        _set_stroke(c, BORDER)
+        _set_line_width(c, 1)
         c.roundRect(margin_x, y - card_h, content_w, card_h, 6, fill=1, stroke=1)
 
-        tx = margin_x + 7 * mm
-        ty = y - card_padding_top
-        c.setFont("Helvetica", 10.8)
-        c.setFillColor(TEXT_DARK)
-        for ln in bullet_lines:
-            ty -= line_h
-            c.drawString(tx, ty, ln)
+        _set_font(c, "Helvetica", 10.8)
+        _set_fill(c, TEXT_DARK)
+        txt = c.beginText(margin_x + TEXT_INSET_D, y - CARD_PAD_D - LINE_H_D)
+        txt.setLeading(LINE_H_D)
+        txt.textLines(bullet_lines)
+        c.drawText(txt)
 
-        y -= (card_h + 8 * mm)
+        y -= card_h + SECTION_GAP_D
         return page_num
 
     def draw_notes(title: str, text: str, page_num: int) -> int:
         nonlocal y
-        note = text.strip() if text.strip() else "None."
-        lines = textwrap.wrap(note, width=100, break_long_words=False, break_on_hyphens=False) or [note]
+        note = text.strip() or "None."
+        lines = greedy_wrap(note, WRAP_NOTES_D) or [note]
 
-        required = (10 + 8 + len(lines) * 5.4 + 18) * mm
+        required = SECTION_BASE_D + len(lines) * SECTION_PER_LINE_D
         y, page_num = ensure_space(required, page_num)
 
-        c.setFont("Helvetica-Bold", 12)
-        c.setFillColor(TEXT_DARK)
+        _set_font(c, "Helvetica-Bold", 12)
+        _set_fill(c, TEXT_DARK)
         c.drawString(margin_x, y, title)
-        y -= 6 * mm
+        y -= TITLE_GAP_D
 
-        card_padding_top = 6 * mm
-        line_h = 5.2 * mm
-        card_h = card_padding_top + len(lines) * line_h + 6 * mm
+        card_h = CARD_PAD_D + len(lines) * LINE_H_D + CARD_PAD_D
 
-        c.setFillColor(colors.white)
-        c.setStrokeColor(BORDER)
-        c.setLineWidth(1)
+        _set_fill(c, WHITE)
+        _set_stroke(c, BORDER)
+        _set_line_width(c, 1)
         c.roundRect(margin_x, y - card_h, content_w, card_h, 6, fill=1, stroke=1)
 
-        c.setFont("Helvetica", 10.8)
-        c.setFillColor(TEXT_DARK)
-        tx = margin_x + 7 * mm
-        ty = y - card_padding_top
-        for ln in lines:
-            ty -= line_h
-            c.drawString(tx, ty, ln)
+        _set_font(c, "Helvetica", 10.8)
+        _set_fill(c, TEXT_DARK)
+        txt = c.beginText(margin_x + TEXT_INSET_D, y - CARD_PAD_D - LINE_H_D)
+        txt.setLeading(LINE_H_D)
+        txt.textLines(lines)
+        c.drawText(txt)
 
-        y -= (card_h + 8 * mm)
+        y -= card_h + SECTION_GAP_D
         return page_num
 
     page = 1
@@ -435,6 +646,7 @@ def pdf_build_detailed(
     return buf.getvalue()
 
 
+@st.cache_data(max_entries=PDF_CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def pdf_build_one_page_condensed(
     *,
     logo_bytes: bytes | None,
@@ -453,95 +665,87 @@ def pdf_build_one_page_condensed(
     print_safe: bool,
 ) -> bytes:
     buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4)
+    c = _new_canvas(buf)
     width, height = A4
 
-    margin_x = 14 * mm
-    margin_top = 14 * mm
-    margin_bottom = 14 * mm
+    margin_x = MARGIN_C
+    margin_top = MARGIN_C
+    margin_bottom = MARGIN_C
     content_w = width - 2 * margin_x
+    title_x = margin_x + (LOGO_GAP_C if logo_bytes else 0)
 
-    reviewed_by_pdf = "" if print_safe else (reviewed_by.strip() if reviewed_by else "")
-    review_date_pdf = "" if print_safe else (review_date.strip() if review_date else "")
+    ctx = _pdf_context(
+        org_name=org_name,
+        reviewed_by=reviewed_by,
+        review_date=review_date,
+        print_safe=print_safe,
+    )
+    gen_line = f"Generated: {created_at}"
 
     def title_bar():
-        bar_h = 16 * mm
-        c.setFillColor(BRAND_DARK)
+        bar_h = HEADER_BAR_C
+        _set_fill(c, BRAND_DARK)
         c.rect(0, height - bar_h, width, bar_h, fill=1, stroke=0)
-        _draw_logo_if_present(c, logo_bytes, margin_x, height - 3 * mm, max_w=22 * mm, max_h=12 * mm)
+        _draw_logo_if_present(c, logo_bytes, margin_x, height - LOGO_TOP_C, max_w=LOGO_MAX_W_C, max_h=LOGO_MAX_H_C)
 
-        c.setFillColor(colors.white)
-        c.setFont("Helvetica-Bold", 13)
-        c.drawString(margin_x + (26 * mm if logo_bytes else 0), height - 11.3 * mm, "Shift Handover (Condensed)")
+        _set_fill(c, WHITE)
+        _set_font(c, "Helvetica-Bold", 13)
+        c.drawString(title_x, height - TITLE_BASE_C, "Shift Handover (Condensed)")
 
-        c.setFont("Helvetica", 9)
-        brand = org_name.strip() if org_name.strip() else APP_NAME
-        c.drawRightString(width - margin_x, height - 11.0 * mm, brand)
+        _set_font(c, "Helvetica", 9)
+        c.drawRightString(width - margin_x, height - BRAND_BASE_C, ctx.brand)
 
     def footer():
-        c.setStrokeColor(BORDER)
-        c.line(margin_x, margin_bottom + 11 * mm, width - margin_x, margin_bottom + 11 * mm)
-        c.setFont("Helvetica", 8.8)
-        c.setFillColor(TEXT_MUTED)
-        c.drawString(margin_x, margin_bottom + 6 * mm, f"Generated: {created_at}")
+        _set_stroke(c, BORDER)
+        c.line(margin_x, margin_bottom + FOOTER_RULE_C, width - margin_x, margin_bottom + FOOTER_RULE_C)
+        _set_font(c, "Helvetica", 8.8)
+        _set_fill(c, TEXT_MUTED)
+        c.drawString(margin_x, margin_bottom + FOOTER_LINE1, gen_line)
 
-        c.setFont("Helvetica", 8.3)
-        c.setFillColor(TEXT_MUTED)
-        c.drawString(margin_x, margin_bottom + 2.5 * mm, f"{APP_NAME} {APP_VERSION} • Support: {SUPPORT_EMAIL}")
+        _set_font(c, "Helvetica", 8.3)
+        _set_fill(c, TEXT_MUTED)
+        c.drawString(margin_x, margin_bottom + FOOTER_LINE2, FOOTER_APP_LINE)
 
-        if reviewed_by_pdf or review_date_pdf:
-            rb = reviewed_by_pdf if reviewed_by_pdf else "—"
-            rd = review_date_pdf if review_date_pdf else "—"
-            c.drawRightString(width - margin_x, margin_bottom + 2.5 * mm, f"Reviewed by: {rb} • {rd}")
+        if ctx.review_line:
+            c.drawRightString(width - margin_x, margin_bottom + FOOTER_LINE2, ctx.review_line)
 
     def block(y, title, text, max_lines=6):
-        items = clean_lines(text)
-        wrap_width = 95
-        lines = []
-        if not items:
-            lines = ["- None."]
-        else:
-            for it in items:
-                wrapped = textwrap.wrap(it, width=wrap_width, break_long_words=False, break_on_hyphens=False)
-                lines.append("- " + wrapped[0])
-                for cont in wrapped[1:]:
-                    lines.append("  " + cont)
-
+        lines = layout_bullets(text, WRAP_BLOCK_C, "- ", "  ", "- None.", max_lines)
         if len(lines) > max_lines:
-            lines = lines[:max_lines] + ["(more in app)"]
+            lines = lines[:max_lines] + ("(more in app)",)
 
-        c.setFillColor(TEXT_DARK)
-        c.setFont("Helvetica-Bold", 11)
+        _set_fill(c, TEXT_DARK)
+        _set_font(c, "Helvetica-Bold", 11)
         c.drawString(margin_x, y, title)
-        y -= 5 * mm
+        y -= TITLE_GAP_C
 
-        c.setFillColor(colors.white)
-        c.setStrokeColor(BORDER)
-        c.setLineWidth(1)
-        h = (len(lines) * 4.8 * mm) + 8 * mm
+        _set_fill(c, WHITE)
+        _set_stroke(c, BORDER)
+        _set_line_width(c, 1)
+        h = len(lines) * LINE_H_C + CARD_PAD_C
         c.roundRect(margin_x, y - h, content_w, h, 6, fill=1, stroke=1)
 
-        c.setFont("Helvetica", 9.8)
-        c.setFillColor(TEXT_DARK)
-        ty = y - 6 * mm
-        for ln in lines:
-            c.drawString(margin_x + 6 * mm, ty, ln)
-            ty -= 4.8 * mm
+        _set_font(c, "Helvetica", 9.8)
+        _set_fill(c, TEXT_DARK)
+        txt = c.beginText(margin_x + TEXT_INSET_C, y - TEXT_TOP_C)
+        txt.setLeading(LINE_H_C)
+        txt.textLines(lines)
+        c.drawText(txt)
 
-        return y - h - 6 * mm
+        return y - h - BLOCK_GAP_C
 
     title_bar()
-    y = height - margin_top - 18 * mm
-
-    c.setFillColor(BG_SOFT)
-    c.rect(margin_x, y - 10 * mm, content_w, 10 * mm, fill=1, stroke=0)
-    c.setFillColor(TEXT_DARK)
-    c.setFont("Helvetica-Bold", 9)
-    c.drawString(margin_x + 4 * mm, y - 6.6 * mm, f"Area: {area or '—'}")
-    c.drawString(margin_x + 70 * mm, y - 6.6 * mm, f"Shift: {shift}")
-    c.setFont("Helvetica", 9)
-    c.drawRightString(width - margin_x - 4 * mm, y - 6.6 * mm, f"Generated: {created_at}")
-    y -= 16 * mm
+    y = height - margin_top - META_TOP_C
+
+    _set_fill(c, BG_SOFT)
+    c.rect(margin_x, y - META_H_C, content_w, META_H_C, fill=1, stroke=0)
+    _set_fill(c, TEXT_DARK)
+    _set_font(c, "Helvetica-Bold", 9)
+    c.drawString(margin_x + META_INSET_C, y - META_BASE_C, f"Area: {area or '—'}")
+    c.drawString(margin_x + META_SHIFT_X_C, y - META_BASE_C, f"Shift: {shift}")
+    _set_font(c, "Helvetica", 9)
+    c.drawRightString(width - margin_x - META_INSET_C, y - META_BASE_C, gen_line)
+    y -= META_GAP_C
 
     y = block(y, "Incidents today", incidents, max_lines=6)
     y = block(y, "Staffing issues", staffing, max_lines=5)
@@ -556,6 +760,197 @@ def pdf_build_one_page_condensed(
     return buf.getvalue()
 
 
+# =========================================================
+# PAGE HTML (static, one element each)
+# =========================================================
+HEADER_HTML = (
+    f"<div class='page-header'>"
+    f"<h1 style='margin-bottom:0.25rem'>{APP_NAME}</h1>"
+    f"<div class='subtle'>{VALUE_PROP}</div>"
+    f"<div class='subtle'><b>{WHO_FOR}</b></div>"
+    f"<div class='subtle'>Support: <b>{SUPPORT_EMAIL}</b></div>"
+    f"<div class='pill'>🛡️ {DATA_STATEMENT}</div>"
+    f"</div>"
+)
+
+PRIVACY_HTML = f"""
+<div class="card">
+  <div style="font-weight:800; margin-bottom:6px;">Privacy & Disclaimer</div>
+  <div class="subtle" style="margin-bottom:8px;">{PRIVACY_BANNER}</div>
+  <div style="font-weight:700;">{NOT_RECORD_DISCLAIMER}</div>
+</div>
+"""
+
+DATA_LINE_HTML = f"<div class='footerline'><b>Data:</b> {DATA_STATEMENT}</div>"
+
+FOOTER_HTML = (
+    f"<div class='footerline' style='text-align:center; margin-top:18px;'>"
+    f"{APP_NAME} {APP_VERSION} • {DATA_STATEMENT} • Support: <b>{SUPPORT_EMAIL}</b>"
+    f"</div>"
+)
+
+
+# =========================================================
+# OUTPUT PANEL
+# =========================================================
+def _inputs_digest(*parts: str | bytes | bool | None) -> bytes:
+    """Short BLAKE2b fingerprint of the Generate inputs; each part is length-prefixed so fields can't run together."""
+    h = hashlib.blake2b(digest_size=16)
+    for p in parts:
+        b = p if isinstance(p, bytes) else str(p).encode()
+        h.update(len(b).to_bytes(8, "little"))
+        h.update(b)
+    return h.digest()
+
+
+def _uploaded_logo() -> bytes | None:
+    f = st.session_state.get("logo_file")
+    return f.getvalue() if f else None
+
+
+def _settings_digest(logo_bytes: bytes | None) -> bytes:
+    """Digest of every input that shapes the output except the timestamp: the form, the sidebar and the logo."""
+    ss = st.session_state
+    return _inputs_digest(*(ss.get(k, v) for k, v in DEFAULTS.items()), logo_bytes)
+
+
+def build_output(logo_bytes: bytes | None, incidents: str, staffing: str, residents: str, tasks: str, escalation: str) -> dict:
+    """Everything the output card shows, built once per Generate click and kept in session state."""
+    now = datetime.now()
+    created_at = now_str(now)
+    ss = st.session_state
+    org_name = ss.get("org_name", "")
+    area = ss.get("area", "")
+    shift = ss.get("shift", "Day")
+    completed_by = ss.get("completed_by", "")
+    reviewed_by = ss.get("reviewed_by", "")
+    review_date = ss.get("review_date", "")
+    print_safe_value = ss.get("print_safe", False)
+    pdf_style = ss.get("pdf_style", "detailed")
+
+    # Re-clicking Generate with nothing changed (same minute, so same timestamps) reuses the last output.
+    settings_h = _settings_digest(logo_bytes)
+    digest = _inputs_digest(created_at, settings_h)
+    last = ss.get("last_output")
+    if last and ss.get("_last_h") == digest:
+        return last
+
+    sbar = make_sbar_oneliner(
+        area=area,
+        shift=shift,
+        incidents=incidents,
+        staffing=staffing,
+        residents=residents,
+        tasks=tasks,
+        escalation=escalation,
+    )
+
+    summary_md = make_handover_summary_md(
+        area=area,
+        shift=shift,
+        created_at=created_at,
+        incidents=incidents,
+        staffing=staffing,
+        residents=residents,
+        tasks=tasks,
+        escalation=escalation,
+        reviewed_by=reviewed_by,
+        review_date=review_date,
+        print_safe=print_safe_value,
+    )
+
+    if pdf_style == "onepage":
+        pdf_bytes = pdf_build_one_page_condensed(
+            logo_bytes=logo_bytes,
+            org_name=org_name,
+            area=area,
+            shift=shift,
+            created_at=created_at,
+            reviewed_by=reviewed_by,
+            review_date=review_date,
+            incidents=incidents,
+            staffing=staffing,
+            residents=residents,
+            tasks=tasks,
+            escalation=escalation,
+            sbar=sbar,
+            print_safe=print_safe_value,
+        )
+        file_suffix = "condensed"
+    else:
+        pdf_bytes = pdf_build_detailed(
+            logo_bytes=logo_bytes,
+            org_name=org_name,
+            area=area,
+            shift=shift,
+            created_at=created_at,
+            completed_by=completed_by,
+            reviewed_by=reviewed_by,
+            review_date=review_date,
+            incidents=incidents,
+            staffing=staffing,
+            residents=residents,
+            tasks=tasks,
+            escalation=escalation,
+            sbar=sbar,
+            print_safe=print_safe_value,
+        )
+        file_suffix = "detailed"
+
+    safe_tag = "_printsafe" if print_safe_value else ""
+    filename = f"handover_{file_suffix}{safe_tag}_{now.strftime('%Y%m%d_%H%M')}.pdf"
+
+    ss["_last_h"] = digest
+    return {
+        "summary_md": summary_md,
+        "overflow_md": summary_overflow_md(incidents, staffing, residents, tasks),
+        "sbar": sbar,
+        "pdf": pdf_bytes,
+        "filename": filename,
+        "settings_h": settings_h,
+    }
+
+
+@st.fragment
+def render_output():
+    """
+    Right-hand output card, drawn from the last generated output. Runs as a fragment
+    so widgets inside it (the download button) rerun only this panel.
+    """
+    st.subheader("Output")
+
+    out = st.session_state.get("last_output")
+    if not out:
+        st.info("Use demo/templates (sidebar) or fill the form, then click **Generate handover**.")
+        st.html(DATA_LINE_HTML)
+        return
+
+    # Settings or text changed since this was generated (e.g. print-safe switched on):
+    # don't show or offer a PDF that no longer matches them.
+    if out["settings_h"] != _settings_digest(_uploaded_logo()):
+        st.info("Inputs or document settings have changed. Click **Generate handover** to update the output.")
+        st.html(DATA_LINE_HTML)
+        return
+
+    st.markdown(out["summary_md"])
+    if out["overflow_md"]:
+        with st.expander("Show all items", expanded=False):
+            st.markdown(out["overflow_md"])
+    st.divider()
+    st.subheader("SBAR one-liner")
+    st.code(out["sbar"], language="text")
+
+    st.download_button(
+        "Download PDF",
+        data=out["pdf"],
+        file_name=out["filename"],
+        mime="application/pdf",
+        use_container_width=True,
+    )
+
+    st.html(DATA_LINE_HTML)
+
+
 # =========================================================
 # STREAMLIT UI
 # =========================================================
@@ -567,111 +962,14 @@ check_access()
 # Apply queued state changes BEFORE widgets render
 apply_state_actions_before_widgets()
 
-# Dark theme CSS (background same as sidebar)
-st.markdown(
-    """
-<style>
-/* App background = sidebar colour */
-.stApp { background-color: #0b1220; color: #f8fafc; }
-
-/* Sidebar */
-section[data-testid="stSidebar"]{
-  background-color:#0b1220;
-  border-right: 1px solid #111827;
-}
-section[data-testid="stSidebar"] * { color:#f8fafc !important; }
-
-/* Cards */
-.card{
-  background-color:#111827;
-  border:1px solid #334155;
-  border-radius:14px;
-  padding:18px 18px 10px 18px;
-  margin-bottom:16px;
-  box-shadow: 0 10px 26px rgba(0,0,0,0.25);
-}
-
-/* Text */
-.subtle{ color:#cbd5e1; }
-.pill{
-  display:inline-block;
-  padding:6px 10px;
-  border-radius:999px;
-  background:#0f172a;
-  border:1px solid #334155;
-  color:#f8fafc;
-  font-size:0.85rem;
-}
-.footerline{ color:#94a3b8; font-size:0.9rem; margin-top:8px; }
-
-/* Inputs - main + sidebar (dark inputs, bright text) */
-div[data-testid="stAppViewContainer"] input,
-div[data-testid="stAppViewContainer"] textarea,
-div[data-testid="stAppViewContainer"] select,
-section[data-testid="stSidebar"] input,
-section[data-testid="stSidebar"] textarea,
-section[data-testid="stSidebar"] select{
-  background-color:#020617 !important;
-  color:#f8fafc !important;
-  border:1px solid #334155 !important;
-  border-radius:10px !important;
-}
-div[data-testid="stAppViewContainer"] input::placeholder,
-div[data-testid="stAppViewContainer"] textarea::placeholder,
-section[data-testid="stSidebar"] input::placeholder,
-section[data-testid="stSidebar"] textarea::placeholder{
-  color:#94a3b8 !important;
-  opacity:1 !important;
-}
-div[data-testid="stAppViewContainer"] input,
-div[data-testid="stAppViewContainer"] textarea,
-section[data-testid="stSidebar"] input,
-section[data-testid="stSidebar"] textarea{
-  caret-color:#f8fafc !important;
-}
-
-/* Buttons */
-.stButton>button{
-  background:#2563eb !important;
-  color:#ffffff !important;
-  border:0 !important;
-  border-radius:12px !important;
-  font-weight:700 !important;
-  padding:0.65rem 1rem !important;
-}
-.stDownloadButton>button{
-  background:#0f172a !important;
-  color:#ffffff !important;
-  border:1px solid #334155 !important;
-  border-radius:12px !important;
-  font-weight:700 !important;
-  padding:0.65rem 1rem !important;
-}
-pre { border-radius:12px !important; }
-</style>
-""",
-    unsafe_allow_html=True,
-)
+# Dark theme CSS. A style-only st.html goes to the event container, skipping the markdown renderer.
+st.html(CSS_PATH)
 
 # Header
-st.markdown(f"<h1 style='margin-bottom:0.25rem'>{APP_NAME}</h1>", unsafe_allow_html=True)
-st.markdown(f"<div class='subtle'>{VALUE_PROP}</div>", unsafe_allow_html=True)
-st.markdown(f"<div class='subtle'><b>{WHO_FOR}</b></div>", unsafe_allow_html=True)
-st.markdown(f"<div class='subtle'>Support: <b>{SUPPORT_EMAIL}</b></div>", unsafe_allow_html=True)
-st.markdown(f"<div class='pill'>🛡️ {DATA_STATEMENT}</div>", unsafe_allow_html=True)
-st.write("")
+st.html(HEADER_HTML)
 
 # Privacy banner (now readable on dark)
-st.markdown(
-    f"""
-<div class="card">
-  <div style="font-weight:800; margin-bottom:6px;">Privacy & Disclaimer</div>
-  <div class="subtle" style="margin-bottom:8px;">{PRIVACY_BANNER}</div>
-  <div style="font-weight:700;">{NOT_RECORD_DISCLAIMER}</div>
-</div>
-""",
-    unsafe_allow_html=True,
-)
+st.html(PRIVACY_HTML)
 
 # How-to (safe string)
 with st.expander("How to use (1 minute)"):
@@ -687,8 +985,8 @@ with st.expander("How to use (1 minute)"):
 with st.sidebar:
     st.subheader("Document settings")
 
-    logo_file = st.file_uploader("Logo (PNG/JPG) for PDF", type=["png", "jpg", "jpeg"])
-    logo_bytes = logo_file.getvalue() if logo_file else None
+    st.file_uploader("Logo (PNG/JPG) for PDF", type=["png", "jpg", "jpeg"], key="logo_file")
+    logo_bytes = _uploaded_logo()
 
     st.text_input("Organisation name (optional)", key="org_name", placeholder="e.g., Penylan Care Home")
     st.text_input("Area / Unit (optional)", key="area", placeholder="e.g., Cedar Wing / Ward 7")
@@ -704,12 +1002,11 @@ with st.sidebar:
     st.toggle(
         "Print-safe mode (hide identity fields)",
         key="print_safe",
-        value=False,
         help="Hides Completed by / Reviewed by / Review date in PDF and on-screen. Does NOT auto-redact free-text boxes.",
     )
 
     st.divider()
-    st.radio("PDF style", ["Detailed (multi-page)", "One-page (condensed)"], key="pdf_style", index=0)
+    st.radio("PDF style", list(PDF_STYLES), format_func=PDF_STYLES.__getitem__, key="pdf_style")
 
     st.divider()
     st.subheader("Quick actions")
@@ -740,117 +1037,27 @@ with st.sidebar:
 left, right = st.columns([1, 1], gap="large")
 
 with left:
-    st.markdown("<div class='card'>", unsafe_allow_html=True)
-    st.subheader("Input")
-
-    incidents = st.text_area("Incidents today", height=140, key="incidents", placeholder="One item per line…")
-    staffing = st.text_area("Staffing issues", height=110, key="staffing", placeholder="One item per line…")
-    residents = st.text_area("Residents of concern", height=140, key="residents", placeholder="One item per line…")
-    tasks = st.text_area("Tasks outstanding", height=140, key="tasks", placeholder="One item per line…")
-    escalation = st.text_input("Escalation / Notes (optional)", key="escalation", placeholder="Optional…")
-
-    generate = st.button("Generate handover", type="primary", use_container_width=True)
-    st.markdown(f"<div class='footerline'><b>Data:</b> {DATA_STATEMENT}</div>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-with right:
-    st.markdown("<div class='card'>", unsafe_allow_html=True)
-    st.subheader("Output")
-
-    if generate:
-        created_at = now_str()
-        print_safe_value = st.session_state.get("print_safe", False)
-
-        sbar = make_sbar_oneliner(
-            area=st.session_state.get("area", ""),
-            shift=st.session_state.get("shift", "Day"),
-            incidents=incidents,
-            staffing=staffing,
-            residents=residents,
-            tasks=tasks,
-            escalation=escalation,
-        )
+    with st.container(border=True, key="input_card"):
+        st.subheader("Input")
 
-        summary_md = make_handover_summary_md(
-            area=st.session_state.get("area", ""),
-            shift=st.session_state.get("shift", "Day"),
-            created_at=created_at,
-            incidents=incidents,
-            staffing=staffing,
-            residents=residents,
-            tasks=tasks,
-            escalation=escalation,
-            reviewed_by=st.session_state.get("reviewed_by", ""),
-            review_date=st.session_state.get("review_date", ""),
-            print_safe=print_safe_value,
-        )
+        # Batched in a form so typing in the boxes doesn't rerun the script; only Generate does.
+        with st.form("handover_inputs", clear_on_submit=False, border=False):
+            incidents = st.text_area("Incidents today", height=140, key="incidents", placeholder="One item per line…")
+            staffing = st.text_area("Staffing issues", height=110, key="staffing", placeholder="One item per line…")
+            residents = st.text_area("Residents of concern", height=140, key="residents", placeholder="One item per line…")
+            tasks = st.text_area("Tasks outstanding", height=140, key="tasks", placeholder="One item per line…")
+            escalation = st.text_input("Escalation / Notes (optional)", key="escalation", placeholder="Optional…")
 
-        st.markdown(summary_md)
-        st.divider()
-        st.markdown("### SBAR one-liner")
-        st.code(sbar, language="text")
-
-        if st.session_state.get("pdf_style", "Detailed (multi-page)").startswith("One-page"):
-            pdf_bytes = pdf_build_one_page_condensed(
-                logo_bytes=logo_bytes,
-                org_name=st.session_state.get("org_name", ""),
-                area=st.session_state.get("area", ""),
-                shift=st.session_state.get("shift", "Day"),
-                created_at=created_at,
-                reviewed_by=st.session_state.get("reviewed_by", ""),
-                review_date=st.session_state.get("review_date", ""),
-                incidents=incidents,
-                staffing=staffing,
-                residents=residents,
-                tasks=tasks,
-                escalation=escalation,
-                sbar=sbar,
-                print_safe=print_safe_value,
-            )
-            file_suffix = "condensed"
-        else:
-            pdf_bytes = pdf_build_detailed(
-                logo_bytes=logo_bytes,
-                org_name=st.session_state.get("org_name", ""),
-                area=st.session_state.get("area", ""),
-                shift=st.session_state.get("shift", "Day"),
-                created_at=created_at,
-                completed_by=st.session_state.get("completed_by", ""),
-                reviewed_by=st.session_state.get("reviewed_by", ""),
-                review_date=st.session_state.get("review_date", ""),
-                incidents=incidents,
-                staffing=staffing,
-                residents=residents,
-                tasks=tasks,
-                escalation=escalation,
-                sbar=sbar,
-                print_safe=print_safe_value,
-            )
-            file_suffix = "detailed"
-
-        safe_tag = "_printsafe" if print_safe_value else ""
-        filename = f"handover_{file_suffix}{safe_tag}_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-
-        st.download_button(
-            "Download PDF",
-            data=pdf_bytes,
-            file_name=filename,
-            mime="application/pdf",
-            use_container_width=True,
-        )
+            generate = st.form_submit_button("Generate handover", type="primary", use_container_width=True)
+        st.html(DATA_LINE_HTML)
 
-        st.markdown(f"<div class='footerline'><b>Data:</b> {DATA_STATEMENT}</div>", unsafe_allow_html=True)
-    else:
-        st.info("Use demo/templates (sidebar) or fill the form, then click **Generate handover**.")
-        st.markdown(f"<div class='footerline'><b>Data:</b> {DATA_STATEMENT}</div>", unsafe_allow_html=True)
+if generate:
+    st.session_state["last_output"] = build_output(logo_bytes, incidents, staffing, residents, tasks, escalation)
 
-    st.markdown("</div>", unsafe_allow_html=True)
+with right:
+    with st.container(border=True, key="output_card"):
+        render_output()
 
 # Footer
-st.markdown(
-    f"<div class='footerline' style='text-align:center; margin-top:18px;'>"
-    f"{APP_NAME} {APP_VERSION} • {DATA_STATEMENT} • Support: <b>{SUPPORT_EMAIL}</b>"
-    f"</div>",
-    unsafe_allow_html=True,
-)
+st.html(FOOTER_HTML)
 